@@ -6,9 +6,8 @@
 
 import os
 import time
-import json
 import logging
-from typing import List, Dict, Tuple
+from typing import List, Tuple
 from datetime import datetime
 from pathlib import Path
 
@@ -66,24 +65,24 @@ class DataManager:
         except OSError:
             return -1.0
     
-    def load_json_data(self, path: Path) -> List[Dict]:
+    def load_json_data(self, path: Path) -> List[scraper.MimaRecord]:
         """加载JSON数据"""
         try:
             if not path.exists():
                 return []
             
-            with open(path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-                return data if isinstance(data, list) else []
-        except (json.JSONDecodeError, IOError) as e:
+            records, skipped = scraper.decode_records(path.read_bytes())
+            if skipped:
+                self.logger.warning(f"JSON数据中有 {skipped} 条记录格式不正确，已跳过")
+            return records
+        except (ValueError, IOError) as e:
             self.logger.error(f"加载JSON数据失败: {e}")
             return []
     
-    def save_json_data(self, data: List[Dict], path: Path) -> bool:
+    def save_json_data(self, data: List[scraper.MimaRecord], path: Path) -> bool:
         """保存JSON数据"""
         try:
-            with open(path, 'w', encoding='utf-8') as f:
-                json.dump(data, f, ensure_ascii=False, indent=2)
+            path.write_bytes(scraper.encode_records(data))
             self.logger.info(f"JSON数据已保存到: {path}")
             return True
         except IOError as e:
@@ -109,23 +108,23 @@ class HTMLUpdater:
             self.logger.warning(f"创建HTML备份失败: {e}")
             return False
     
-    def build_card_element(self, soup: BeautifulSoup, item: Dict) -> any:
+    def build_card_element(self, soup: BeautifulSoup, record: scraper.MimaRecord) -> any:
         """构建单个卡片元素"""
         article = soup.new_tag("article", attrs={"class": "card"})
 
         name_div = soup.new_tag("div", attrs={"class": "name"})
-        name_div.string = str(item.get("名称", ""))
+        name_div.string = record.name
 
         pass_div = soup.new_tag("div", attrs={"class": "pass", "aria-label": "密码"})
-        pass_div.string = str(item.get("密码", ""))
+        pass_div.string = record.password
 
         date_div = soup.new_tag("div", attrs={"class": "date"})
-        date_div.string = str(item.get("日期", ""))
+        date_div.string = record.date
 
         article.extend([name_div, pass_div, date_div])
         return article
     
-    def update_html(self, data: List[Dict]) -> bool:
+    def update_html(self, data: List[scraper.MimaRecord]) -> bool:
         """更新HTML文件"""
         try:
             self.logger.info("开始更新index.html")
@@ -148,10 +147,9 @@ class HTMLUpdater:
             section["aria-label"] = "密码列表"
 
             # 添加所有卡片
-            for item in data:
-                if isinstance(item, dict):
-                    card = self.build_card_element(soup, item)
-                    section.append(card)
+            for record in data:
+                card = self.build_card_element(soup, record)
+                section.append(card)
 
             # 写回HTML文件
             with open(self.config.HTML_PATH, 'w', encoding='utf-8') as f:
@@ -0,0 +1,227 @@
+#!/usr/bin/env python3
+"""
+浸泡测试脚本
+在本地替身页面上长时间循环执行抓取，检查浏览器进程是否被完全回收、内存是否保持平稳
+每隔 N 次尝试注入一次故障，超时与驱动崩溃交替出现，后者使 quit() 失败并留下残留进程
+
+用法: python soak.py [--hours 6] [--interval 30] [--fail-every 5]
+"""
+
+import sys
+import time
+import logging
+import argparse
+import threading
+from typing import List, Dict, Optional
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+import zhuaqu as scraper
+
+
+CARD_TEMPLATE = (
+    '<div class="layui-col-md3">'
+    '<p class="overview-bd-t">{name}</p>'
+    '<p class="overview-bd-p">{password}</p>'
+    '<p class="overview-bd-ud">更新 {date}</p>'
+    '</div>'
+)
+
+PAGE_TEMPLATE = (
+    '<!DOCTYPE html><html><head><meta charset="utf-8"><title>overview</title></head>'
+    '<body>{body}</body></html>'
+)
+
+
+class SoakConfig:
+    """浸泡测试配置类"""
+    def __init__(self, hours: float, interval: float, fail_every: int):
+        self.DURATION = hours * 3600
+        self.RETRY_INTERVAL = interval
+        self.FAIL_EVERY = fail_every      # 每隔 N 次尝试注入一次故障，0 表示不注入
+        self.CRASH_DELAY = 1              # 浏览器启动后多久结束驱动服务进程（秒）
+        self.WARMUP_ATTEMPTS = 5          # 预热次数，不计入内存基线
+        self.WINDOW = 10                  # 计算内存基线和末段内存时使用的样本数
+        self.RSS_GROWTH_LIMIT_MB = 50     # 允许的当前进程内存增长
+        self.ELEMENT_WAIT_TIMEOUT = 5
+        self.CARD_WAIT_TIMEOUT = 5
+
+
+class StandInPageHandler(BaseHTTPRequestHandler):
+    """本地替身页面，结构与目标网站的卡片区域一致"""
+    broken = False    # 为 True 时返回缺少卡片的页面，使抓取等待超时
+
+    def do_GET(self):
+        if self.path != '/':
+            self.send_error(404)
+            return
+
+        if self.broken:
+            body = '<div id="placeholder"></div>'
+        else:
+            date = time.strftime('%Y-%m-%d')
+            cards = ''.join(
+                CARD_TEMPLATE.format(name=name, password=f"{i:04d}", date=date)
+                for i, name in enumerate(["零号大坝", "长弓溪谷", "巴克什", "航天基地", "潮汐监狱"], 1)
+            )
+            body = f'<div id="overview-bd-sortable-cards">{cards}</div>'
+
+        content = PAGE_TEMPLATE.format(body=body).encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class SoakRunner:
+    """浸泡测试执行器"""
+    def __init__(self, config: SoakConfig):
+        self.config = config
+        self.logger = logging.getLogger(__name__)
+        self.reports: List[Dict] = []
+
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), StandInPageHandler)
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}/"
+
+    def injection_for(self, attempt: int) -> Optional[str]:
+        """返回本次尝试注入的故障类型：'timeout'、'crash' 或 None"""
+        if not self.config.FAIL_EVERY or attempt % self.config.FAIL_EVERY:
+            return None
+        return 'crash' if (attempt // self.config.FAIL_EVERY) % 2 == 0 else 'timeout'
+
+    def crash_driver(self, web_scraper: scraper.WebScraper, done: threading.Event):
+        """等待浏览器启动后强制结束驱动服务进程，模拟驱动崩溃"""
+        while not done.is_set() and web_scraper.browser_manager.driver is None:
+            time.sleep(0.1)
+        if done.wait(self.config.CRASH_DELAY):
+            return
+
+        driver = web_scraper.browser_manager.driver
+        process = getattr(getattr(driver, 'service', None), 'process', None)
+        if process is not None:
+            self.logger.info(f"注入故障: 结束驱动服务进程 {process.pid}")
+            process.kill()
+
+    def run_attempt(self, injected: Optional[str]) -> Dict:
+        """执行一次抓取，与主循环一样每次创建新的抓取器"""
+        web_scraper = scraper.WebScraper()
+        web_scraper.config.TARGET_URL = self.url
+        web_scraper.config.ELEMENT_WAIT_TIMEOUT = self.config.ELEMENT_WAIT_TIMEOUT
+        web_scraper.config.CARD_WAIT_TIMEOUT = self.config.CARD_WAIT_TIMEOUT
+
+        # 两种故障都返回缺少卡片的页面，保证崩溃注入时抓取仍在等待中
+        StandInPageHandler.broken = injected is not None
+        done = threading.Event()
+        crasher = None
+        if injected == 'crash':
+            crasher = threading.Thread(target=self.crash_driver, args=(web_scraper, done), daemon=True)
+            crasher.start()
+
+        try:
+            results = web_scraper.scrape_data()
+        finally:
+            done.set()
+            if crasher is not None:
+                crasher.join()
+
+        report = dict(web_scraper.last_process_report)
+        report['success'] = results is not None
+        report['injected'] = injected
+        return report
+
+    def check(self) -> List[str]:
+        """检查测试结果，返回失败原因列表"""
+        failures = []
+
+        not_spawned = [i for i, r in enumerate(self.reports, 1) if not r['spawned']]
+        if not_spawned:
+            failures.append(f"第 {not_spawned} 次尝试未启动任何浏览器进程")
+
+        unexpected = [i for i, r in enumerate(self.reports, 1) if not r['injected'] and not r['success']]
+        if unexpected:
+            failures.append(f"第 {unexpected} 次尝试未注入故障但抓取失败")
+
+        crashes = [r for r in self.reports if r['injected'] == 'crash']
+        if crashes and not sum(r['reaped'] for r in crashes):
+            failures.append("驱动崩溃注入后未产生需要回收的残留进程，回收路径未被覆盖")
+
+        leaked = [i for i, r in enumerate(self.reports, 1) if r['leaked']]
+        if leaked:
+            failures.append(f"第 {leaked} 次尝试后存在未回收的进程")
+
+        over_limit = [i for i, r in enumerate(self.reports, 1) if r['limit_exceeded']]
+        if over_limit:
+            failures.append(f"第 {over_limit} 次尝试中浏览器内存超过上限")
+
+        samples = [r['self_rss_mb'] for r in self.reports[self.config.WARMUP_ATTEMPTS:]]
+        if len(samples) >= self.config.WINDOW * 2:
+            baseline = sorted(samples[:self.config.WINDOW])[self.config.WINDOW // 2]
+            final = sorted(samples[-self.config.WINDOW:])[self.config.WINDOW // 2]
+            growth = final - baseline
+            self.logger.info(f"当前进程内存: 基线 {baseline} MB, 末段 {final} MB, 增长 {growth:.1f} MB")
+            if growth > self.config.RSS_GROWTH_LIMIT_MB:
+                failures.append(f"当前进程内存增长 {growth:.1f} MB，超过 {self.config.RSS_GROWTH_LIMIT_MB} MB")
+        else:
+            failures.append(f"样本数不足（{len(samples)} 个），无法判断内存趋势")
+
+        return failures
+
+    def run(self) -> bool:
+        """运行浸泡测试"""
+        if scraper.psutil is None:
+            self.logger.error("浸泡测试需要安装 psutil")
+            return False
+
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.logger.info(f"替身页面已启动: {self.url}")
+
+        start_time = time.time()
+        try:
+            while time.time() - start_time < self.config.DURATION:
+                attempt = len(self.reports) + 1
+                report = self.run_attempt(self.injection_for(attempt))
+                self.reports.append(report)
+                print(f"ATTEMPT {attempt} INJECTED={report['injected']} SUCCESS={report['success']} "
+                      f"SPAWNED={report['spawned']} REAPED={report['reaped']} "
+                      f"LEAKED={report['leaked']} PEAK_RSS_MB={report['peak_rss_mb']} "
+                      f"SELF_RSS_MB={report['self_rss_mb']}", flush=True)
+                time.sleep(self.config.RETRY_INTERVAL)
+        finally:
+            self.server.shutdown()
+            self.server.server_close()
+
+        failures = self.check()
+        for failure in failures:
+            self.logger.error(failure)
+
+        if failures:
+            self.logger.error(f"浸泡测试失败，共执行 {len(self.reports)} 次")
+            return False
+
+        self.logger.info(f"浸泡测试通过，共执行 {len(self.reports)} 次")
+        return True
+
+
+def main() -> bool:
+    """主函数"""
+    parser = argparse.ArgumentParser(description="浏览器进程浸泡测试")
+    parser.add_argument('--hours', type=float, default=6, help="测试时长（小时）")
+    parser.add_argument('--interval', type=float, default=30, help="两次抓取之间的间隔（秒）")
+    parser.add_argument('--fail-every', type=int, default=5, help="每隔 N 次尝试注入一次故障（超时与驱动崩溃交替），0 表示不注入")
+    args = parser.parse_args()
+
+    logging.basicConfig(
+        level=logging.INFO,
+        format='[%(asctime)s] %(levelname)s: %(message)s',
+        datefmt='%Y-%m-%d %H:%M:%S'
+    )
+    runner = SoakRunner(SoakConfig(args.hours, args.interval, args.fail_every))
+    return runner.run()
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
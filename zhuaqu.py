@@ -8,7 +8,9 @@ import os
 import json
 import time
 import logging
-from typing import List, Dict, Tuple, Optional
+import threading
+from typing import List, Dict, Tuple, Optional, Iterable
+from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
 
@@ -19,6 +21,94 @@ from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException, WebDriverException
 from bs4 import BeautifulSoup
 
+try:
+    import psutil
+except ImportError:  # 未安装 psutil 时禁用进程监控
+    psutil = None
+
+try:
+    import orjson
+except ImportError:  # 未安装 orjson 时回退到标准库 json
+    orjson = None
+
+
+# 地图顺序，同时作为合法地图名称的白名单
+MAP_ORDER = (
+    "零号大坝",
+    "长弓溪谷",
+    "巴克什",
+    "航天基地",
+    "潮汐监狱"
+)
+_MAP_RANK = {name: rank for rank, name in enumerate(MAP_ORDER)}
+
+
+@dataclass(frozen=True, slots=True)
+class MimaRecord:
+    """密码记录，创建时校验地图名称、4位密码和ISO日期"""
+    name: str
+    password: str
+    date: str
+
+    def __post_init__(self):
+        if not all(isinstance(value, str) for value in (self.name, self.password, self.date)):
+            raise ValueError(f"记录字段应为字符串: {self!r}")
+        if self.name not in _MAP_RANK:
+            raise ValueError(f"未知的地图名称: {self.name!r}")
+        if not (len(self.password) == 4 and self.password.isascii() and self.password.isdigit()):
+            raise ValueError(f"密码应为4位数字: {self.password!r}")
+        try:
+            # strptime 允许省略前导零并接受全角数字，额外校验长度和 ASCII 以保证 YYYY-MM-DD 格式
+            if len(self.date) != 10 or not self.date.isascii():
+                raise ValueError
+            datetime.strptime(self.date, '%Y-%m-%d')
+        except ValueError:
+            raise ValueError(f"日期格式不正确: {self.date!r}") from None
+
+    @property
+    def rank(self) -> int:
+        """按照预定义地图顺序的排序键值"""
+        return _MAP_RANK[self.name]
+
+    @classmethod
+    def from_dict(cls, item: Dict) -> 'MimaRecord':
+        """从JSON对象创建记录"""
+        return cls(item.get('名称'), item.get('密码'), item.get('日期'))
+
+    def to_dict(self) -> Dict[str, str]:
+        """转换为JSON对象，键名与本地数据文件保持一致"""
+        return {
+            '名称': self.name,
+            '密码': self.password,
+            '日期': self.date
+        }
+
+
+def decode_records(raw: bytes) -> Tuple[List[MimaRecord], int]:
+    """
+    解析JSON数据为记录列表
+    返回记录列表和被跳过的无效条目数，顶层不是列表时抛出 ValueError
+    """
+    data = orjson.loads(raw) if orjson else json.loads(raw)
+    if not isinstance(data, list):
+        raise ValueError("数据格式不正确，应为列表")
+
+    records, skipped = [], 0
+    for item in data:
+        try:
+            records.append(MimaRecord.from_dict(item))
+        except (AttributeError, ValueError):
+            skipped += 1
+    return records, skipped
+
+
+def encode_records(records: Iterable[MimaRecord]) -> bytes:
+    """将记录列表编码为JSON，格式与 json.dump(ensure_ascii=False, indent=2) 一致"""
+    data = [record.to_dict() for record in records]
+    if orjson:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2)
+    return json.dumps(data, ensure_ascii=False, indent=2).encode('utf-8')
+
 
 class ScrapingConfig:
     """抓取配置类"""
@@ -29,16 +119,205 @@ class ScrapingConfig:
         self.CARD_WAIT_TIMEOUT = 10
         self.OUTPUT_DIR = Path(__file__).parent / "output"
         self.JSON_FILENAME = "mima_data.json"
+        self.BROWSER_RSS_LIMIT_MB = 1536      # 浏览器进程树内存上限
+        self.PROCESS_SAMPLE_INTERVAL = 1.0    # 进程采样间隔（秒）
+        self.PROCESS_REAP_TIMEOUT = 5         # 等待残留进程退出的时间（秒）
         
         # 确保输出目录存在
         self.OUTPUT_DIR.mkdir(exist_ok=True)
 
 
+class ProcessSupervisor:
+    """
+    浏览器进程监控类
+    跟踪驱动派生的进程，每次抓取结束后回收残留进程，并限制进程树的内存占用
+    """
+    def __init__(self, config: ScrapingConfig):
+        self.config = config
+        self.logger = logging.getLogger(__name__)
+        self.enabled = psutil is not None
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._watchdog = None
+        self._baseline = set()
+        self._root_pids = []
+        self._tracked = {}
+        self.peak_rss = 0
+        self.limit_exceeded = False
+
+        if not self.enabled:
+            self.logger.warning("未安装 psutil，浏览器进程监控已禁用")
+
+    def begin_attempt(self):
+        """开始一次抓取：记录已有子进程并启动内存监控线程"""
+        if not self.enabled:
+            return
+
+        self._baseline = {p.pid for p in self._children(psutil.Process())}
+        self._root_pids = []
+        self._tracked = {}
+        self.peak_rss = 0
+        self.limit_exceeded = False
+
+        self._stop_event.clear()
+        self._watchdog = threading.Thread(target=self._watch, name="browser-watchdog", daemon=True)
+        self._watchdog.start()
+
+    def track_driver(self, driver):
+        """登记驱动服务进程，其派生的浏览器进程随之被跟踪"""
+        if not self.enabled:
+            return
+
+        process = getattr(getattr(driver, 'service', None), 'process', None)
+        pid = getattr(process, 'pid', None)
+        if pid is not None:
+            self._root_pids.append(pid)
+        self._refresh()
+
+    def end_attempt(self) -> Dict:
+        """结束一次抓取：回收所有残留进程并返回本次的进程与内存统计"""
+        report = {
+            'spawned': 0,
+            'reaped': 0,
+            'leaked': 0,
+            'peak_rss_mb': 0.0,
+            'self_rss_mb': 0.0,
+            'limit_exceeded': False
+        }
+        if not self.enabled:
+            return report
+
+        self._stop_event.set()
+        if self._watchdog is not None:
+            self._watchdog.join()
+            self._watchdog = None
+
+        self._refresh()
+        alive = self._alive()
+
+        # 驱动正常退出后给进程留出自行结束的时间，再依次 terminate / kill
+        alive = self._wait(alive)
+        stragglers = len(alive)
+        if alive:
+            self._signal(alive, 'terminate')
+            alive = self._wait(alive)
+        if alive:
+            self._signal(alive, 'kill')
+            alive = self._wait(alive)
+
+        report.update({
+            'spawned': len(self._tracked),
+            'reaped': stragglers - len(alive),
+            'leaked': len(alive),
+            'peak_rss_mb': round(self.peak_rss / 1024 / 1024, 1),
+            'self_rss_mb': round(psutil.Process().memory_info().rss / 1024 / 1024, 1),
+            'limit_exceeded': self.limit_exceeded
+        })
+
+        self.logger.info(f"进程统计: 派生 {report['spawned']} 个, "
+                         f"回收残留 {report['reaped']} 个, "
+                         f"未能回收 {report['leaked']} 个, "
+                         f"浏览器内存峰值 {report['peak_rss_mb']} MB, "
+                         f"当前进程内存 {report['self_rss_mb']} MB")
+        if report['leaked']:
+            self.logger.error(f"存在无法回收的浏览器进程: {[p.pid for p in alive]}")
+
+        return report
+
+    def _children(self, process) -> List:
+        """获取进程的全部后代进程"""
+        try:
+            return process.children(recursive=True)
+        except (psutil.NoSuchProcess, psutil.AccessDenied):
+            return []
+
+    def _refresh(self):
+        """收集本次抓取新派生的进程（浏览器可能在驱动退出后被重新挂靠，需提前记录）"""
+        candidates = [p for p in self._children(psutil.Process()) if p.pid not in self._baseline]
+        for pid in self._root_pids:
+            try:
+                root = psutil.Process(pid)
+            except psutil.NoSuchProcess:
+                continue
+            candidates.append(root)
+            candidates.extend(self._children(root))
+
+        with self._lock:
+            for process in candidates:
+                self._tracked.setdefault(process.pid, process)
+
+    def _alive(self) -> List:
+        """返回仍在运行的被跟踪进程"""
+        with self._lock:
+            tracked = list(self._tracked.values())
+        return self._running(tracked)
+
+    def _running(self, processes: List) -> List:
+        """过滤出仍在运行的进程，僵尸进程视为已退出"""
+        alive = []
+        for process in processes:
+            try:
+                if process.is_running() and process.status() != psutil.STATUS_ZOMBIE:
+                    alive.append(process)
+            except psutil.NoSuchProcess:
+                continue
+            except psutil.AccessDenied:
+                alive.append(process)
+        return alive
+
+    def _wait(self, processes: List) -> List:
+        """
+        等待进程退出，返回超时后仍在运行的进程
+        非子进程被重新挂靠后可能长期处于僵尸状态，wait_procs 会将其视为存活，因此每轮都重新过滤
+        """
+        deadline = time.monotonic() + self.config.PROCESS_REAP_TIMEOUT
+        alive = self._running(processes)
+        while alive and time.monotonic() < deadline:
+            _, alive = psutil.wait_procs(alive, timeout=0.2)
+            alive = self._running(alive)
+        return alive
+
+    def _total_rss(self, processes: List) -> int:
+        """统计进程列表的常驻内存总量（字节）"""
+        total = 0
+        for process in processes:
+            try:
+                total += process.memory_info().rss
+            except (psutil.NoSuchProcess, psutil.AccessDenied):
+                continue
+        return total
+
+    def _signal(self, processes: List, method: str):
+        """向进程列表发送 terminate 或 kill"""
+        for process in processes:
+            try:
+                getattr(process, method)()
+            except (psutil.NoSuchProcess, psutil.AccessDenied):
+                continue
+
+    def _watch(self):
+        """内存监控线程：进程树超过内存上限时强制结束，使本次抓取失败"""
+        limit = self.config.BROWSER_RSS_LIMIT_MB * 1024 * 1024
+
+        while not self._stop_event.wait(self.config.PROCESS_SAMPLE_INTERVAL):
+            self._refresh()
+            alive = self._alive()
+            rss = self._total_rss(alive)
+            self.peak_rss = max(self.peak_rss, rss)
+
+            if rss > limit and not self.limit_exceeded:
+                self.limit_exceeded = True
+                self.logger.error(f"浏览器进程内存 {rss // 1024 // 1024} MB 超过上限 "
+                                  f"{self.config.BROWSER_RSS_LIMIT_MB} MB，强制结束浏览器")
+                self._signal(alive, 'kill')
+
+
 class BrowserManager:
     """浏览器管理类"""
-    def __init__(self):
+    def __init__(self, supervisor: Optional[ProcessSupervisor] = None):
         self.driver = None
         self.browser_name = None
+        self.supervisor = supervisor
         self.logger = logging.getLogger(__name__)
     
     def create_driver(self) -> Tuple[webdriver.Remote, str]:
@@ -87,6 +366,8 @@ class BrowserManager:
                 driver = browser['class'](options=browser['options'])
                 self.driver = driver
                 self.browser_name = browser['name']
+                if self.supervisor:
+                    self.supervisor.track_driver(driver)
                 
                 self.logger.info(f"成功启动 {browser['name']} 浏览器")
                 return driver, browser['name']
@@ -105,6 +386,8 @@ class BrowserManager:
                 self.logger.info("浏览器已关闭")
             except Exception as e:
                 self.logger.warning(f"关闭浏览器时出现异常: {e}")
+            finally:
+                self.driver = None
 
 
 class DataExtractor:
@@ -112,8 +395,8 @@ class DataExtractor:
     def __init__(self):
         self.logger = logging.getLogger(__name__)
     
-    def extract_card_data(self, card) -> Dict[str, str]:
-        """从单个卡片中提取数据"""
+    def extract_card_data(self, card) -> Optional[MimaRecord]:
+        """从单个卡片中提取数据，数据不完整或校验失败时返回 None"""
         try:
             name_element = card.find('p', class_='overview-bd-t')
             password_element = card.find('p', class_='overview-bd-p')
@@ -123,18 +406,10 @@ class DataExtractor:
             password = password_element.text.strip() if password_element else 'N/A'
             date = date_element.text.strip().replace('更新', '').strip() if date_element else 'N/A'
             
-            return {
-                '名称': name,
-                '密码': password,
-                '日期': date
-            }
+            return MimaRecord(name, password, date)
         except Exception as e:
             self.logger.warning(f"提取卡片数据失败: {e}")
-            return {
-                '名称': 'N/A',
-                '密码': 'N/A',
-                '日期': 'N/A'
-            }
+            return None
 
 
 class DataProcessor:
@@ -143,87 +418,58 @@ class DataProcessor:
         self.config = config
         self.logger = logging.getLogger(__name__)
         self.json_path = self.config.OUTPUT_DIR / self.config.JSON_FILENAME
-        
-        # 定义地图顺序
-        self.map_order = [
-            "零号大坝",
-            "长弓溪谷", 
-            "巴克什",
-            "航天基地",
-            "潮汐监狱"
-        ]
     
-    def load_local_data(self) -> List[Dict]:
+    def load_local_data(self) -> List[MimaRecord]:
         """加载本地JSON数据"""
         if not self.json_path.exists():
             self.logger.info("本地数据文件不存在")
             return []
         
         try:
-            with open(self.json_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-                if isinstance(data, list):
-                    self.logger.info(f"成功加载本地数据，共 {len(data)} 条记录")
-                    return data
-                else:
-                    self.logger.warning("本地数据格式不正确，应为列表")
-                    return []
-        except (json.JSONDecodeError, IOError) as e:
+            records, skipped = decode_records(self.json_path.read_bytes())
+        except (ValueError, IOError) as e:
             self.logger.error(f"加载本地数据失败: {e}")
             return []
+        
+        if skipped:
+            self.logger.warning(f"本地数据中有 {skipped} 条记录格式不正确，已跳过")
+        self.logger.info(f"成功加载本地数据，共 {len(records)} 条记录")
+        return records
     
-    def sort_data(self, data: List[Dict]) -> List[Dict]:
+    def sort_data(self, data: List[MimaRecord]) -> List[MimaRecord]:
         """按照预定义顺序对数据进行排序"""
-        def get_sort_key(item: Dict) -> int:
-            """获取排序键值"""
-            name = item.get('名称', '')
-            try:
-                return self.map_order.index(name)
-            except ValueError:
-                # 如果地图名称不在预定义列表中，放在最后
-                return len(self.map_order)
-        
-        sorted_data = sorted(data, key=get_sort_key)
-        self.logger.debug(f"数据已按照预定义顺序排序: {[item['名称'] for item in sorted_data]}")
+        sorted_data = sorted(data, key=lambda record: record.rank)
+        self.logger.debug(f"数据已按照预定义顺序排序: {[record.name for record in sorted_data]}")
         return sorted_data
     
-    def merge_data(self, scraped_data: List[Dict], local_data: List[Dict]) -> Tuple[List[Dict], Dict]:
+    def merge_data(self, scraped_data: List[MimaRecord],
+                   local_data: List[MimaRecord]) -> Tuple[List[MimaRecord], Dict]:
         """
         合并抓取数据和本地数据
         基于"名称"进行合并，当"日期"或"密码"不同时更新
         """
-        local_by_name = {item.get('名称'): item for item in local_data if isinstance(item, dict)}
+        local_by_name = {record.name: record for record in local_data}
         final_by_name = dict(local_by_name)  # 拷贝本地数据
         
         added, updated, unchanged = [], [], []
         
-        for item in scraped_data:
-            if not isinstance(item, dict):
-                continue
-                
-            name = item.get('名称')
-            if not name or name == 'N/A':
-                continue
-                
-            local_item = local_by_name.get(name)
+        for record in scraped_data:
+            name = record.name
+            local_record = local_by_name.get(name)
             
-            if local_item is None:
+            if local_record is None:
                 # 新增
-                final_by_name[name] = item
+                final_by_name[name] = record
                 added.append(name)
+            elif record != local_record:
+                # 名称相同，日期或密码不同时更新
+                final_by_name[name] = record
+                updated.append(name)
             else:
-                # 检查是否需要更新
-                date_changed = item.get('日期') != local_item.get('日期')
-                password_changed = item.get('密码') != local_item.get('密码')
-                
-                if date_changed or password_changed:
-                    final_by_name[name] = item
-                    updated.append(name)
-                else:
-                    unchanged.append(name)
+                unchanged.append(name)
         
         # 使用自定义排序方法，按照预定义顺序排序
-        merged_list = self.sort_data([final_by_name[k] for k in final_by_name.keys()])
+        merged_list = self.sort_data(list(final_by_name.values()))
         
         stats = {
             'added': added,
@@ -236,11 +482,10 @@ class DataProcessor:
         
         return merged_list, stats
     
-    def save_data(self, data: List[Dict]) -> bool:
+    def save_data(self, data: List[MimaRecord]) -> bool:
         """保存数据到JSON文件"""
         try:
-            with open(self.json_path, 'w', encoding='utf-8') as f:
-                json.dump(data, f, ensure_ascii=False, indent=2)
+            self.json_path.write_bytes(encode_records(data))
             
             self.logger.info(f"数据已保存到: {self.json_path}")
             return True
@@ -254,7 +499,8 @@ class WebScraper:
     """网页抓取器主类"""
     def __init__(self):
         self.config = ScrapingConfig()
-        self.browser_manager = BrowserManager()
+        self.process_supervisor = ProcessSupervisor(self.config)
+        self.browser_manager = BrowserManager(self.process_supervisor)
         self.data_extractor = DataExtractor()
         self.data_processor = DataProcessor(self.config)
         
@@ -265,10 +511,12 @@ class WebScraper:
             datefmt='%Y-%m-%d %H:%M:%S'
         )
         self.logger = logging.getLogger(__name__)
+        self.last_process_report = None
     
-    def scrape_data(self) -> Optional[List[Dict]]:
+    def scrape_data(self) -> Optional[List[MimaRecord]]:
         """抓取数据的核心方法"""
         driver = None
+        self.process_supervisor.begin_attempt()
         
         try:
             # 创建浏览器驱动
@@ -312,9 +560,11 @@ class WebScraper:
             # 提取每张卡片的数据
             results = []
             for i, card in enumerate(cards, 1):
-                card_data = self.data_extractor.extract_card_data(card)
-                results.append(card_data)
-                self.logger.debug(f"第 {i} 张卡片: {card_data['名称']}")
+                record = self.data_extractor.extract_card_data(card)
+                if record is None:
+                    continue
+                results.append(record)
+                self.logger.debug(f"第 {i} 张卡片: {record.name}")
             
             self.logger.info(f"成功抓取 {len(results)} 条数据（使用 {browser_name}）")
             return results
@@ -329,8 +579,10 @@ class WebScraper:
             
         finally:
             self.browser_manager.close()
+            # 无论成功与否都回收本次派生的浏览器进程
+            self.last_process_report = self.process_supervisor.end_attempt()
     
-    def process_and_save(self, scraped_data: List[Dict]) -> bool:
+    def process_and_save(self, scraped_data: List[MimaRecord]) -> bool:
         """处理和保存数据"""
         if not scraped_data:
             self.logger.warning("没有抓取到有效数据")